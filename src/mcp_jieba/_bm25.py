@@ -0,0 +1,224 @@
+"""
+Vectorized BM25 scoring for keyword extraction.
+
+Kept in its own module so that numpy (and optionally scipy/numba) are only
+imported when extract_keywords is actually used; tokenize/tag-only
+deployments never pay the import cost.
+"""
+from typing import List, Optional
+
+import numpy as np
+
+try:
+    from scipy import sparse as _scipy_sparse
+except ImportError:
+    _scipy_sparse = None
+
+try:
+    from numba import njit as _njit
+except ImportError:
+    _njit = None
+
+# Above this TF-matrix density the dense path wins (sparse overhead dominates)
+_SPARSE_DENSITY_THRESHOLD = 0.2
+
+
+if _njit is not None:
+
+    @_njit(cache=True, fastmath=True)
+    def _bm25_csr_kernel(data, indices, indptr, idf, doc_lens, avgdl, V, k1, b):
+        """Fused BM25 scoring over CSR arrays: one pass, no intermediates."""
+        out = np.zeros(V, dtype=np.float32)
+        for i in range(len(indptr) - 1):
+            dl_norm = k1 * (1.0 - b + b * doc_lens[i] / avgdl)
+            for p in range(indptr[i], indptr[i + 1]):
+                j = indices[p]
+                tf = data[p]
+                out[j] += idf[j] * tf * (k1 + 1.0) / (tf + dl_norm)
+        return out
+
+    @_njit(cache=True, fastmath=True)
+    def _bm25_coo_kernel(tf, rows, cols, idf, doc_lens, avgdl, V, k1, b):
+        """Fused BM25 scoring over aggregated (doc, term, tf) triplets."""
+        out = np.zeros(V, dtype=np.float32)
+        for p in range(tf.shape[0]):
+            i = rows[p]
+            j = cols[p]
+            f = tf[p]
+            dl_norm = k1 * (1.0 - b + b * doc_lens[i] / avgdl)
+            out[j] += idf[j] * f * (k1 + 1.0) / (f + dl_norm)
+        return out
+
+else:
+    _bm25_csr_kernel = None
+    _bm25_coo_kernel = None
+
+
+def _bm25_word_scores_sparse(
+    doc_indices: np.ndarray, token_ids: np.ndarray, N: int, V: int, k1: float, b: float
+) -> Optional[np.ndarray]:
+    """
+    Compute aggregated BM25 scores per vocabulary term using a CSR TF matrix.
+
+    Memory is O(nnz) instead of O(N*V) and the arithmetic only touches
+    nonzero entries. Returns None if the corpus is degenerate (avgdl == 0).
+    """
+    data = np.ones(len(token_ids), dtype=np.float32)
+    # Duplicate (doc, term) pairs are summed during COO->CSR conversion,
+    # which yields the term frequencies directly.
+    tf = _scipy_sparse.csr_matrix((data, (doc_indices, token_ids)), shape=(N, V))
+
+    # Document frequencies from the CSC column pointers. Cast to float32 up
+    # front so the whole IDF chain stays float32 instead of promoting to
+    # float64 — BM25 rankings do not depend on bit-exact scores.
+    df = np.diff(tf.tocsc().indptr).astype(np.float32)
+
+    # standard BM25 IDF: log((N - df + 0.5) / (df + 0.5) + 1), fused as log1p
+    idf = np.log1p((N - df + 0.5) / (df + 0.5))
+
+    doc_lens = np.asarray(tf.sum(axis=1)).ravel()
+    avgdl = doc_lens.mean() if N > 0 else 0
+    if avgdl == 0:
+        return None
+
+    # score = idf * (tf * (k1 + 1)) / (tf + k1 * (1 - b + b * dl / avgdl))
+    if _bm25_csr_kernel is not None:
+        # Fused numba kernel: single pass over tf.data, no temporaries
+        return _bm25_csr_kernel(
+            tf.data, tf.indices, tf.indptr, idf, doc_lens, avgdl, V, k1, b
+        )
+
+    # BM25S-style eager scoring: evaluate per-(doc, term) scores directly on
+    # the CSR data array — no numerator/denominator matrix copies — then
+    # reduce per term with one bincount over the column indices.
+    row = np.repeat(np.arange(N, dtype=np.intp), np.diff(tf.indptr))
+    tfd = tf.data
+    denom = tfd + (k1 * (1 - b + b * doc_lens / avgdl))[row]
+    scores = idf[tf.indices] * tfd * (k1 + 1) / denom
+
+    # Sum scores across all sentences for each word
+    return np.bincount(tf.indices, weights=scores, minlength=V).astype(np.float32)
+
+
+def _bm25_word_scores_coo(
+    doc_indices: np.ndarray, token_ids: np.ndarray, N: int, V: int, k1: float, b: float
+) -> Optional[np.ndarray]:
+    """
+    Numba path for installations without scipy: aggregate (doc, term)
+    occurrence counts with np.unique, then score the triplets in one jitted
+    loop. No (N, V) matrix is ever allocated.
+    """
+    keys = doc_indices.astype(np.int64) * V + token_ids
+    uniq_keys, counts = np.unique(keys, return_counts=True)
+    rows = (uniq_keys // V).astype(np.intp)
+    cols = (uniq_keys % V).astype(np.intp)
+    tf = counts.astype(np.float32)
+
+    df = np.bincount(cols, minlength=V).astype(np.float32)
+    idf = np.log1p((N - df + 0.5) / (df + 0.5))
+
+    doc_lens = np.bincount(rows, weights=tf, minlength=N).astype(np.float32)
+    avgdl = doc_lens.mean() if N > 0 else 0
+    if avgdl == 0:
+        return None
+
+    return _bm25_coo_kernel(tf, rows, cols, idf, doc_lens, avgdl, V, k1, b)
+
+
+def _bm25_word_scores_dense(
+    doc_indices: np.ndarray, token_ids: np.ndarray, N: int, V: int, k1: float, b: float
+) -> Optional[np.ndarray]:
+    """
+    Dense NumPy fallback for BM25 scoring, used when scipy is unavailable
+    or the TF matrix is dense enough that CSR overhead would dominate.
+    """
+    # One C-level bincount over flattened (doc, term) keys; np.add.at goes
+    # through the much slower buffered ufunc.at machinery
+    counts = np.bincount(doc_indices * V + token_ids, minlength=N * V)
+    tf_matrix = counts.reshape(N, V).astype(np.float32)
+
+    # Document Frequencies (number of docs containing term); float32 so the
+    # IDF chain does not promote to float64
+    df = np.count_nonzero(tf_matrix, axis=0).astype(np.float32)
+
+    # standard BM25 IDF: log((N - df + 0.5) / (df + 0.5) + 1), fused as log1p
+    idf = np.log1p((N - df + 0.5) / (df + 0.5))
+
+    doc_lens = tf_matrix.sum(axis=1)
+    avgdl = doc_lens.mean() if N > 0 else 0
+    if avgdl == 0:
+        return None
+
+    # score = idf * (tf * (k1 + 1)) / (tf + k1 * (1 - b + b * dl / avgdl))
+    numerator = tf_matrix * (k1 + 1)
+    denom_term = k1 * (1 - b + b * doc_lens[:, None] / avgdl)
+    denominator = tf_matrix + denom_term
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scores_matrix = idf * (numerator / denominator)
+        scores_matrix = np.nan_to_num(scores_matrix)
+
+    # Sum scores across all sentences for each word
+    return scores_matrix.sum(axis=0, dtype=np.float32)
+
+
+def prewarm() -> None:
+    """
+    Trigger numba JIT compilation on tiny inputs so the first real request
+    does not pay the compile cost. No-op when numba is not installed.
+    """
+    if _njit is None:
+        return
+    di = np.zeros(1, dtype=np.intp)
+    ti = np.zeros(1, dtype=np.intp)
+    if _scipy_sparse is not None:
+        _bm25_word_scores_sparse(di, ti, 1, 1, 1.5, 0.75)
+    _bm25_word_scores_coo(di, ti, 1, 1, 1.5, 0.75)
+
+
+def top_k_keywords(docs_tokens: List[List[str]], top_k: int) -> List[str]:
+    """
+    Score a tokenized corpus (one token list per sentence/document) with
+    BM25 and return the top_k highest-scoring vocabulary terms.
+
+    k1 = 1.5, b = 0.75 (standard defaults).
+    """
+    N = len(docs_tokens)
+    doc_lens = [len(d) for d in docs_tokens]
+    flat_tokens = [t for d in docs_tokens for t in d]
+
+    # Vectorized vocabulary building and ID mapping
+    unique_tokens, token_ids = np.unique(flat_tokens, return_inverse=True)
+    V = len(unique_tokens)
+
+    # Create document indices for each token
+    doc_indices = np.repeat(np.arange(N), doc_lens)
+
+    k1 = 1.5
+    b = 0.75
+
+    # CSR when scipy is available and the matrix is sparse enough
+    # (the usual case for sentence-level corpora); dense otherwise.
+    est_density = len(flat_tokens) / (N * V)
+    if _scipy_sparse is not None and est_density <= _SPARSE_DENSITY_THRESHOLD:
+        word_scores = _bm25_word_scores_sparse(doc_indices, token_ids, N, V, k1, b)
+    elif _scipy_sparse is None and _bm25_coo_kernel is not None:
+        # No scipy but numba available: jitted triplet loop, still O(nnz)
+        word_scores = _bm25_word_scores_coo(doc_indices, token_ids, N, V, k1, b)
+    else:
+        word_scores = _bm25_word_scores_dense(doc_indices, token_ids, N, V, k1, b)
+
+    if word_scores is None:
+        return []
+
+    # Top-K selection: O(V + k log k) via argpartition, then one descending
+    # sort of the k survivors (negated keys, no reversed view)
+    k = min(top_k, V)
+    if k <= 0:
+        # argpartition(-0)[-0:] would return the whole vocabulary
+        return []
+    top_indices = np.argpartition(word_scores, -k)[-k:]
+    top_indices = top_indices[np.argsort(-word_scores[top_indices])]
+
+    # Map back to words by indexing the unique-token array directly
+    return unique_tokens[top_indices].tolist()
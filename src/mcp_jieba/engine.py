@@ -1,25 +1,132 @@
 import os
 import re
-from numpy.random import f
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 import rjieba
-import numpy as np
-from typing import List, Union, Dict, Set
+from typing import List, Optional, Sequence, Tuple, Union, Dict, Set
 
+# Tokens made purely of punctuation/symbols (incl. underscore)
+_PUNCT_RE = re.compile(r"^[\W_]+$", re.UNICODE)
+
+# Common Chinese/English sentence terminators, for corpus splitting
+_SENT_SPLIT = re.compile(r"[。！？!?\n;；]+")
+
+
+@functools.lru_cache(maxsize=4096)
+def _cut(content: str) -> Tuple[str, ...]:
+    """Cached exact-mode segmentation. Tuples are hashable and shared across hits."""
+    return tuple(rjieba.cut(content))
+
+
+@functools.lru_cache(maxsize=4096)
+def _cut_for_search(content: str) -> Tuple[str, ...]:
+    """Cached search-engine-mode segmentation."""
+    return tuple(rjieba.cut_for_search(content))
+
+
+@functools.lru_cache(maxsize=4096)
+def _tag(content: str) -> Tuple[Tuple[str, str], ...]:
+    """Cached POS tagging, as a tuple of (word, flag) pairs."""
+    return tuple((w, f) for w, f in rjieba.tag(content))
+
+
+@functools.singledispatch
+def normalize_texts(text) -> List[str]:
+    """Normalize tool input (str or list of str) to a list, at the boundary.
+
+    singledispatch resolves on the input type through the C-level registry
+    instead of scattering isinstance branches across every entry point.
+    """
+    raise TypeError(f"text must be str or list[str], got {type(text).__name__}")
+
+
+@normalize_texts.register(str)
+def _(text) -> List[str]:
+    return [text]
+
+
+@normalize_texts.register(list)
+def _(text) -> List[str]:
+    return text
+
+
+# rjieba releases the GIL inside its Rust calls, so a thread pool gives
+# near-linear scaling on multi-document batches. Created lazily and shared.
+_POOL: Optional[ThreadPoolExecutor] = None
+_POOL_LOCK = threading.Lock()
+
+# Below this many items, thread dispatch costs more than it saves
+_PARALLEL_THRESHOLD = 4
+
+
+def _get_pool() -> ThreadPoolExecutor:
+    """Return the shared tokenization thread pool, creating it once."""
+    global _POOL
+    if _POOL is None:
+        with _POOL_LOCK:
+            if _POOL is None:
+                _POOL = ThreadPoolExecutor(
+                    max_workers=min(8, os.cpu_count() or 1),
+                    thread_name_prefix="mcp-jieba",
+                )
+    return _POOL
+
+
+def shutdown_pool() -> None:
+    """Shut down the shared tokenization pool, if it was ever created."""
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is not None:
+            _POOL.shutdown(wait=False)
+            _POOL = None
 
-class JiebaEngine:
-    _instance = None
-    _stopwords: Set[str] = set()
-    _initialized = False
 
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super(JiebaEngine, cls).__new__(cls)
-        return cls._instance
+# ASCII unit separator: never produced by natural text, cheap to test for
+_BATCH_SENTINEL = "\x1f"
+
+
+def _cut_batch(contents: List[str], mode: str = "exact") -> List[Sequence[str]]:
+    """
+    Segment several documents with a single rjieba call.
+
+    Joins the documents on an ASCII unit-separator sentinel, cuts once, and
+    splits the token stream back per document, so the Python<->Rust FFI
+    boundary is crossed once per batch instead of once per document. Falls
+    back to the per-document (cached) path when the sentinel appears in the
+    input or the reassembly does not line up.
+
+    Callers only iterate the returned token sequences, so the cached paths
+    hand back the LRU tuples as-is instead of copying them into lists.
+    """
+    cached = _cut_for_search if mode == "search" else _cut
+    if len(contents) < 2 or any(_BATCH_SENTINEL in c for c in contents):
+        return [cached(c) for c in contents]
+
+    cut = rjieba.cut_for_search if mode == "search" else rjieba.cut
+    docs: List[List[str]] = [[]]
+    for token in cut(_BATCH_SENTINEL.join(contents)):
+        if _BATCH_SENTINEL in token:
+            head, *rest = token.split(_BATCH_SENTINEL)
+            if head:
+                docs[-1].append(head)
+            for part in rest:
+                docs.append([part] if part else [])
+        else:
+            docs[-1].append(token)
+
+    if len(docs) != len(contents):
+        # Tokenizer merged sentinels unexpectedly; redo per document
+        return [cached(c) for c in contents]
+    return docs
+
+
+class JiebaEngine:
+    _stopwords: Set[str]
 
     def __init__(self):
-        if not self._initialized:
-            self._load_stopwords()
-            self._initialized = True
+        self._load_stopwords()
 
     def _load_stopwords(self):
         """Load stopwords from the package resource."""
@@ -29,28 +136,64 @@ class JiebaEngine:
                 os.path.dirname(__file__), "resources", "stopwords.txt"
             )
             if os.path.exists(resource_path):
-                with open(resource_path, "r", encoding="utf-8") as f:
-                    self._stopwords = set(line.strip() for line in f if line.strip())
+                # One bulk read + str.split(): whitespace handling (incl. CRLF)
+                # and empty-line skipping happen in C instead of a Python loop
+                with open(resource_path, "rb") as f:
+                    self._stopwords = frozenset(f.read().decode("utf-8").split())
             else:
                 # Fallback or empty if not found (should not happen with correct install)
-                self._stopwords = set()
+                self._stopwords = frozenset()
         except Exception as e:
             print(f"Warning: Failed to load stopwords: {e}")
-            self._stopwords = set()
-
-    def _is_valid_token(self, token: str) -> bool:
-        """Check if a token is valid (not a stopword and not purely punctuation)."""
-        token = token.strip()
-        if not token:
-            return False
-        if token in self._stopwords:
-            return False
-        # Basic punctuation filter: if the token is just punctuation/symbols
-        # This is a simple heuristic; for more complex needs, regex could be used.
-        # Here we assume if it's in stopwords (which includes punctuation), it's filtered.
-        # If it's not in stopwords but is a symbol not in the list, we might keep it
-        # or we can add a simple check.
-        return True
+            self._stopwords = frozenset()
+
+    def _filter_tokens(self, tokens, pool: Optional[Dict[str, str]] = None) -> List[str]:
+        """Drop empty tokens, stopwords and pure-punctuation tokens.
+
+        rjieba tokens are already stripped, so the predicate is just a
+        frozenset membership test plus a precompiled regex match; both are
+        bound to locals to keep the hot loop free of attribute lookups.
+
+        When a pool dict is given, surviving tokens are deduplicated through
+        it so repeated tokens across a batch share one str object instead of
+        each occurrence being a fresh allocation from the tokenizer.
+        """
+        sw = self._stopwords
+        punct = _PUNCT_RE.match
+        if pool is None:
+            return [t for t in tokens if t and t not in sw and not punct(t)]
+        intern = pool.setdefault
+        return [intern(t, t) for t in tokens if t and t not in sw and not punct(t)]
+
+    def process_batch(self, texts: List[str], mode: str = "exact") -> List[List[str]]:
+        """
+        Segment a batch of documents in one pass.
+
+        Args:
+            texts: The documents to segment.
+            mode: "exact" or "search".
+
+        Returns:
+            One token list per input, in order; non-string entries yield [].
+        """
+        str_items = [(idx, c) for idx, c in enumerate(texts) if isinstance(c, str)]
+        results: List[List[str]] = [[] for _ in texts]
+
+        if len(str_items) == 1:
+            # Single document: serve the filtered result straight from cache
+            idx, content = str_items[0]
+            results[idx] = list(_process_one(content, mode))
+            return results
+
+        # Batch all string inputs through one FFI call; non-strings yield []
+        token_lists = _cut_batch([c for _, c in str_items], mode)
+        # Shared per-batch intern table: frequent tokens ("的", "是", ...)
+        # collapse to one str object across all documents
+        pool: Dict[str, str] = {}
+        for (idx, _), raw_tokens in zip(str_items, token_lists):
+            results[idx] = self._filter_tokens(raw_tokens, pool)
+
+        return results
 
     def process(
         self, text: Union[str, List[str]], mode: str = "exact"
@@ -63,27 +206,31 @@ class JiebaEngine:
             mode: "exact" or "search".
 
         Returns:
-            A dictionary where keys are indices (as strings) and values are lists of tokens.
+            A dictionary where keys are indices and values are lists of tokens.
         """
-        # Normalize input to list
-        inputs = [text] if isinstance(text, str) else text
-        results = {}
+        return dict(enumerate(self.process_batch(normalize_texts(text), mode)))
 
-        for idx, content in enumerate(inputs):
-            if not isinstance(content, str):
-                results[idx] = []
-                continue
-
-            if mode == "search":
-                # cut_for_search returns an iterator or list depending on implementation
-                raw_tokens = rjieba.cut_for_search(content)
-            else:
-                # Default to exact mode
-                raw_tokens = rjieba.cut(content)
+    def tag_batch(self, texts: List[str]) -> List[Dict[str, str]]:
+        """
+        POS-tag a batch of documents in one pass.
 
-            # Filter tokens
-            filtered_tokens = [t for t in raw_tokens if self._is_valid_token(t)]
-            results[idx] = filtered_tokens
+        Returns:
+            One {word: flag} dict per input, in order; non-string entries
+            yield {}.
+        """
+        str_items = [(idx, c) for idx, c in enumerate(texts) if isinstance(c, str)]
+        contents = [c for _, c in str_items]
+        if len(contents) >= _PARALLEL_THRESHOLD:
+            # _tag releases the GIL in Rust, so pool threads run in parallel
+            tag_lists = list(_get_pool().map(_tag, contents))
+        else:
+            tag_lists = [_tag(c) for c in contents]
+
+        results: List[Dict[str, str]] = [{} for _ in texts]
+        for (idx, _), tags in zip(str_items, tag_lists):
+            # Convert to dict for better JSON serialization; words and flags
+            # are already str, so no re-formatting is needed
+            results[idx] = {w: flag for w, flag in tags}
 
         return results
 
@@ -95,22 +242,9 @@ class JiebaEngine:
             text: A single string or a list of strings.
 
         Returns:
-            A dictionary where keys are indices (as strings) and values are dicts of {word : flag}.
+            A dictionary where keys are indices and values are dicts of {word : flag}.
         """
-        inputs = [text] if isinstance(text, str) else text
-        results = {}
-
-        for idx, content in enumerate(inputs):
-            if not isinstance(content, str):
-                results[idx] = {}
-                continue
-
-            # rjieba.tag returns a list of tuples [(word, flag), ...]
-            tags = rjieba.tag(content)
-            # Convert to dict for better JSON serialization
-            results[idx]= {f"{t[0]}": f"{t[1]}" for t in tags}
-
-        return results
+        return dict(enumerate(self.tag_batch(normalize_texts(text))))
 
     def extract_keywords_bm25(
         self, texts: Union[str, List[str]], top_k: int = 5
@@ -127,120 +261,97 @@ class JiebaEngine:
             A dictionary where keys are indices (as strings) and values are lists of keywords.
             Even for a single string input, returns {'0': [...]}.
         """
-        # Normalize input to list
-        is_single_input = isinstance(texts, str)
-        inputs = [texts] if is_single_input else texts
+        return dict(enumerate(self.extract_keywords_batch(normalize_texts(texts), top_k)))
 
-        results = {}
+    def extract_keywords_batch(
+        self, texts: List[str], top_k: int = 5
+    ) -> List[List[str]]:
+        """
+        Extract keywords for a batch of documents in one pass.
 
-        for idx, text in enumerate(inputs):
-            if not isinstance(text, str) or not text.strip():
-                results[idx] = []
-                continue
+        Each document is treated as its own corpus (split into sentences).
+        Returns one keyword list per input, in order; non-string or blank
+        entries yield [].
+        """
+        # Lazy: keeps numpy/scipy off the import path of tokenize/tag-only use
+        from mcp_jieba import _bm25
 
-            # 1. Split into sentences to form the corpus
-            # Simple split by common Chinese/English sentence terminators
-            sentences = re.split(r"[。！？!?\n;；]+", text)
-            sentences = [s.strip() for s in sentences if s.strip()]
+        results: List[List[str]] = [[] for _ in texts]
 
+        # 1. Split every document into sentences up front, remembering which
+        #    slice of the flat sentence list belongs to which document, so
+        #    segmentation runs as one batch instead of per document.
+        all_sentences: List[str] = []
+        doc_slices: List[Tuple[int, int, int]] = []  # (doc idx, start, stop)
+        for idx, text in enumerate(texts):
+            if not isinstance(text, str) or not text.strip():
+                continue
+            sentences = [s for s in (p.strip() for p in _SENT_SPLIT.split(text)) if s]
             if not sentences:
-                results[idx] = []
                 continue
+            start = len(all_sentences)
+            all_sentences.extend(sentences)
+            doc_slices.append((idx, start, len(all_sentences)))
 
-            # 2. Tokenize sentences and collect tokens
+        if not all_sentences:
+            return results
+
+        # 2. Tokenize all sentences across all documents in a single pass
+        #    (one sentinel-joined FFI call for multi-sentence batches)
+        cut_results = _cut_batch(all_sentences, "exact")
+
+        # 3. Per-document filtering + BM25 scoring. Corpus statistics stay
+        #    per document: each input is its own corpus by contract.
+        for idx, start, stop in doc_slices:
             docs_tokens = []
-            for sent in sentences:
-                raw_tokens = rjieba.cut(sent)
-                tokens = [t for t in raw_tokens if self._is_valid_token(t)]
+            for raw_tokens in cut_results[start:stop]:
+                tokens = self._filter_tokens(raw_tokens)
                 if tokens:
                     docs_tokens.append(tokens)
+            if docs_tokens:
+                results[idx] = _bm25.top_k_keywords(docs_tokens, top_k)
 
-            if not docs_tokens:
-                results[idx] = []
-                continue
-
-            # Vectorized vocabulary building and ID mapping
-            N = len(docs_tokens)
-
-            # Flatten tokens
-            doc_lens = [len(d) for d in docs_tokens]
-            flat_tokens = [t for d in docs_tokens for t in d]
-
-            # Use numpy unique to get unique tokens (vocab) and map all tokens to IDs
-            unique_tokens, token_ids = np.unique(flat_tokens, return_inverse=True)
-
-            # Reconstruct vocab for compatibility with later code
-            vocab = {t: i for i, t in enumerate(unique_tokens)}
-            V = len(unique_tokens)
-
-            # Create document indices for each token
-            doc_indices = np.repeat(np.arange(N), doc_lens)
-
-            # 3. Build Numpy Matrices
-            # TF Matrix
-            tf_matrix = np.zeros((N, V), dtype=np.float32)
-            np.add.at(tf_matrix, (doc_indices, token_ids), 1)
-
-            # 4. Compute BM25 Components
-            # k1 = 1.5, b = 0.75 (standard defaults)
-            k1 = 1.5
-            b = 0.75
-
-            # Document Frequencies (number of docs containing term)
-            df = np.count_nonzero(tf_matrix, axis=0)
-
-            # IDF
-            # standard BM25 IDF: log((N - df + 0.5) / (df + 0.5) + 1)
-            idf = np.log((N - df + 0.5) / (df + 0.5) + 1)
-
-            # Document Lengths
-            doc_lens = tf_matrix.sum(axis=1)
-            avgdl = doc_lens.mean() if N > 0 else 0
-
-            if avgdl == 0:
-                results[idx] = []
-                continue
-
-            # BM25 Scores
-            # score = idf * (tf * (k1 + 1)) / (tf + k1 * (1 - b + b * dl / avgdl))
-
-            # Reshape for broadcasting
-            # tf_matrix: (N, V)
-            # idf: (V,) -> broadcast to (N, V)
-            # doc_lens: (N,) -> broadcast to (N, 1)
-
-            numerator = tf_matrix * (k1 + 1)
-
-            # Denominator term: k1 * (1 - b + b * doc_lens[:, None] / avgdl)
-            # Shape (N, 1)
-            denom_term = k1 * (1 - b + b * doc_lens[:, None] / avgdl)
-
-            denominator = tf_matrix + denom_term
-
-            # Avoid division by zero (shouldn't happen as denom_term > 0 usually, but safe check)
-            # scores_matrix (N, V)
-            with np.errstate(divide="ignore", invalid="ignore"):
-                scores_matrix = idf * (numerator / denominator)
-                scores_matrix = np.nan_to_num(scores_matrix)
-
-            # 5. Aggregate scores for the whole text
-            # Sum scores across all sentences for each word
-            word_scores = scores_matrix.sum(axis=0)
-
-            # 6. Get Top-K
-            # Get indices of top-k scores
-            if V <= top_k:
-                top_indices = np.argsort(word_scores)[::-1]
-            else:
-                # argpartition is faster for large V
-                top_indices = np.argpartition(word_scores, -top_k)[-top_k:]
-                # Sort the top k
-                top_indices = top_indices[np.argsort(word_scores[top_indices])[::-1]]
-
-            # Map back to words
-            inv_vocab = {v: k for k, v in vocab.items()}
-            top_keywords = [inv_vocab[i] for i in top_indices]
+        return results
 
-            results[idx] = top_keywords
 
-        return results
+# 进程级单例：懒加载 + 双重检查锁，避免并发请求下重复加载停用词
+_ENGINE: Optional[JiebaEngine] = None
+_ENGINE_LOCK = threading.Lock()
+
+
+def get_engine() -> JiebaEngine:
+    """Return the process-wide JiebaEngine, creating it once (thread-safe)."""
+    global _ENGINE
+    if _ENGINE is None:
+        with _ENGINE_LOCK:
+            # Double-checked: another thread may have won the race
+            if _ENGINE is None:
+                _ENGINE = JiebaEngine()
+    return _ENGINE
+
+
+def warm_in_background() -> threading.Thread:
+    """
+    Kick off engine construction (dictionary + stopword loading) on a daemon
+    thread so startup can overlap it with transport setup. The first request
+    that arrives before the thread finishes simply falls through to the lock
+    in get_engine() and waits there; no duplicate engine is ever built.
+    """
+    thread = threading.Thread(
+        target=get_engine, name="mcp-jieba-warmup", daemon=True
+    )
+    thread.start()
+    return thread
+
+
+@functools.lru_cache(maxsize=4096)
+def _process_one(content: str, mode: str) -> Tuple[str, ...]:
+    """
+    Cached end-to-end result (cut + stopword filter) for a single string.
+
+    Keyed on (content, mode) so repeated MCP requests for the same text skip
+    both segmentation and filtering.
+    """
+    engine = get_engine()
+    raw_tokens = _cut_for_search(content) if mode == "search" else _cut(content)
+    return tuple(engine._filter_tokens(raw_tokens))
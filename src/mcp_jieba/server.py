@@ -1,27 +1,52 @@
 import sys
-import traceback
-import threading
-from typing import List, Union, Callable, Optional
+from typing import List, Union, Callable
 from functools import wraps
 from mcp.server.fastmcp import FastMCP
-from mcp_jieba.engine import JiebaEngine
+from mcp_jieba.engine import get_engine, normalize_texts, shutdown_pool, warm_in_background
 
 # Initialize the FastMCP server
 mcp = FastMCP("mcp-jieba", dependencies=["rjieba", "numpy","mcp_jieba","threading","mcp"])
 
-# 使用线程安全的懒加载
-_engine: Optional[JiebaEngine] = None
-_engine_lock = threading.Lock()
+# 预生成的字符串索引键，避免结果字典构造时逐项调用 str(i)
+_IDX = tuple(map(str, range(4096)))
+
+
+def _key(i: int) -> str:
+    """String key for result index i, served from the precomputed table."""
+    return _IDX[i] if i < 4096 else str(i)
+
+def _format_error(e: BaseException) -> str:
+    """Format the innermost frame of an exception for the tool error payload."""
+    # Walk to the innermost frame directly; traceback.extract_tb
+    # would allocate a FrameSummary per frame just to read one.
+    tb = e.__traceback__
+    while tb is not None and tb.tb_next is not None:
+        tb = tb.tb_next
+    if tb is not None:
+        code = tb.tb_frame.f_code
+        error_location = (
+            f"File '{code.co_filename}', line {tb.tb_lineno}, in {code.co_name}"
+        )
+    else:
+        error_location = "Unknown location"
+    return f"Error Type: {type(e).__name__}\nLocation: {error_location}\nMessage: {str(e)}"
+
+
+class ToolError(RuntimeError):
+    """
+    Tool failure whose detail string is built lazily on first str().
+
+    The traceback walk only runs if FastMCP actually serializes the error;
+    exceptions that get caught and discarded upstream cost nothing.
+    """
+
+    def __init__(self, exc: BaseException):
+        super().__init__()
+        self._exc = exc
+
+    def __str__(self) -> str:
+        return _format_error(self._exc)
 
-def get_engine() -> JiebaEngine:
-    """线程安全的懒加载 JiebaEngine，确保只初始化一次"""
-    global _engine
-    if _engine is None:
-        with _engine_lock:
-            # 双重检查，避免锁竞争后的重复初始化
-            if _engine is None:
-                _engine = JiebaEngine()
-    return _engine
 
 # Exception handling decorator
 def handle_exceptions(func: Callable) -> Callable:
@@ -30,20 +55,11 @@ def handle_exceptions(func: Callable) -> Callable:
     def wrapper(*args, **kwargs):
         try:
             return func(*args, **kwargs)
-        except Exception as e:
-            exc_type, exc_value, exc_traceback = sys.exc_info()
-            tb = traceback.extract_tb(exc_traceback)
-            if tb:
-                last_frame = tb[-1]
-                filename = last_frame.filename
-                lineno = last_frame.lineno
-                funcname = last_frame.name
-                error_location = f"File '{filename}', line {lineno}, in {funcname}"
-            else:
-                error_location = "Unknown location"
-            type_name = exc_type.__name__ if exc_type else "UnknownError"
-            error_msg = f"Error Type: {type_name}\nLocation: {error_location}\nMessage: {str(e)}"
-            raise RuntimeError(error_msg)
+        except (ValueError, TypeError, KeyError, OSError, RuntimeError) as e:
+            # Only wrap the error classes the engine actually raises;
+            # anything else (notably cancellation) propagates untouched so
+            # FastMCP's own handling is not interfered with.
+            raise ToolError(e) from e
     return wrapper
 
 @mcp.tool()
@@ -61,8 +77,8 @@ def tokenize(text: Union[str, List[str]], mode: str = "exact") -> dict:
         Example: {0: ["token1", "token2", ...], 1: [...]}
     """
     engine = get_engine()  # 懒加载获取实例
-    results = engine.process(text, mode)
-    return results
+    texts = normalize_texts(text)
+    return {_key(i): tokens for i, tokens in enumerate(engine.process_batch(texts, mode))}
 
 @mcp.tool()
 @handle_exceptions
@@ -83,8 +99,8 @@ def tag(text: Union[str, List[str]]) -> dict:
         ```
     """
     engine = get_engine()  # 懒加载获取实例
-    results = engine.tag(text)
-    return results
+    texts = normalize_texts(text)
+    return {_key(i): tags for i, tags in enumerate(engine.tag_batch(texts))}
 
 @mcp.tool()
 @handle_exceptions
@@ -102,13 +118,20 @@ def extract_keywords(text: Union[str, List[str]], top_k: int = 3) -> dict:
         Example: {0: ["keyword1", "keyword2", "keyword3", ...], 1: [...]}
     """
     engine = get_engine()  # 懒加载获取实例
-    results = engine.extract_keywords_bm25(text, top_k)
-    return results
+    texts = normalize_texts(text)
+    return {_key(i): kws for i, kws in enumerate(engine.extract_keywords_batch(texts, top_k))}
 
 def main():
     """Main entry point for the server."""
     import argparse
 
+    # 可选 uvloop：libuv 事件循环显著降低高频小请求的调度开销，未安装则跳过
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+
     parser = argparse.ArgumentParser(description="MCP Jieba Server")
     parser.add_argument("--transport", default="http",
                         choices=["stdio", "http"],
@@ -119,34 +142,45 @@ def main():
                         help="Port to bind to (HTTP only)")
     args = parser.parse_args()
 
-    # 从环境变量 BIND_ADDR 获取 host 和 port（格式为 host:port）
+    # 从环境变量 BIND_ADDR 获取 host 和 port（格式为 host:port 或 [v6addr]:port）
     import os
     bind_addr = os.environ.get("BIND_ADDR")
     if bind_addr:
+        # urlsplit 处理 IPv6 字面量（如 [::1]:8000），手写 split(":") 会解析错误
+        from urllib.parse import urlsplit
         try:
-            host, port = bind_addr.split(":")
-            args.host = host
-            args.port = int(port)
+            parsed = urlsplit(f"//{bind_addr}")
+            if parsed.hostname is None or parsed.port is None:
+                raise ValueError(bind_addr)
+            args.host = parsed.hostname
+            args.port = parsed.port
         except ValueError:
             print("Invalid BIND_ADDR format. Expected 'host:port'", file=sys.stderr)
             sys.exit(1)
 
-    if args.transport == "http":
-        # HTTP 模式：使用 SSE 传输协议 (MCP 标准 HTTP 实现)
-        # 创建新实例以应用 host/port 配置
-        server = FastMCP("mcp-jieba", host=args.host, port=args.port)
-
-        # 重新注册工具
-        server.add_tool(tokenize)
-        server.add_tool(tag)
-        server.add_tool(extract_keywords)
-
-        print(f"Starting MCP Jieba server over HTTP at {args.host}:{args.port}...", file=sys.stderr)
-        server.run(transport="streamable-http", mount_path="/mcp")
-    else:
-        # STDIO 模式
-        print("Starting MCP Jieba server over STDIO...", file=sys.stderr)
-        mcp.run(transport="stdio")
+    # 后台预热引擎，与传输层启动并行；首个请求到达时通常已就绪
+    warm_in_background()
+    # 预编译 BM25 numba 内核（未安装 numba 时为空操作），同样放到后台线程
+    import threading
+    from mcp_jieba import _bm25
+    threading.Thread(target=_bm25.prewarm, name="bm25-prewarm", daemon=True).start()
+
+    try:
+        if args.transport == "http":
+            # HTTP 模式：使用 SSE 传输协议 (MCP 标准 HTTP 实现)
+            # 复用模块级实例，仅更新绑定配置；避免重建 FastMCP 和工具 schema
+            mcp.settings.host = args.host
+            mcp.settings.port = args.port
+
+            print(f"Starting MCP Jieba server over HTTP at {args.host}:{args.port}...", file=sys.stderr)
+            mcp.run(transport="streamable-http", mount_path="/mcp")
+        else:
+            # STDIO 模式
+            print("Starting MCP Jieba server over STDIO...", file=sys.stderr)
+            mcp.run(transport="stdio")
+    finally:
+        # 回收引擎的分词线程池
+        shutdown_pool()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
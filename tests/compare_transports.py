@@ -1,10 +1,27 @@
 import asyncio
 import os
 import sys
-import json
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
 
+# orjson (C implementation) when available; stdlib json otherwise
+try:
+    import orjson
+
+    def _loads(data):
+        return orjson.loads(data)
+
+    def _dump_results(results, f):
+        f.write(orjson.dumps(results, option=orjson.OPT_INDENT_2).decode("utf-8"))
+except ImportError:
+    import json
+
+    def _loads(data):
+        return json.loads(data)
+
+    def _dump_results(results, f):
+        json.dump(results, f, ensure_ascii=False, indent=2)
+
 # Configuration
 PYTHON_EXE = sys.executable
 SERVER_SCRIPT = os.path.join("src", "mcp_jieba", "server.py")
@@ -16,8 +33,6 @@ async def main():
     with open(LOREM_FILE, "r", encoding="utf-8") as f:
         lines = [line.strip() for line in f if line.strip()]
 
-    results = []
-
     # Initialize STDIO Server ONCE
     print("Starting STDIO Server Session...")
     server_params = StdioServerParameters(
@@ -30,32 +45,40 @@ async def main():
         async with ClientSession(read, write) as stdio_session:
             await stdio_session.initialize()
 
-            # Test first 5 lines
-            for i, line in enumerate(lines):
-                print(f"Processing line {i+1}/{len(lines)}: {line[:20]}...")
-
-                # 1. Single string - STDIO
-                try:
-                    # Set timeout to detect blocking
-                    result = await asyncio.wait_for(
-                        stdio_session.call_tool("extract_keywords", arguments={"text": line," top_k": 4}),
-                        timeout=10.0
-                    )
-                    stdio_single_json = json.loads(result.content[0].text)
-                except Exception as e:
-                    print(f"Error on line {i+1}: {e}")
-                    stdio_single_json = f"Error: {str(e)}"
-
-                result_entry = {
-                    "line_id": i,
-                    "text": line,
-                    "stdio_single": stdio_single_json,
-                }
-                results.append(result_entry)
+            # Concurrent per-line calls over the same session (MCP multiplexes
+            # requests by id); semaphore bounds the number in flight.
+            sem = asyncio.Semaphore(32)
+
+            async def process_line(i, line):
+                async with sem:
+                    print(f"Processing line {i+1}/{len(lines)}: {line[:20]}...")
+
+                    # 1. Single string - STDIO
+                    try:
+                        # Set timeout to detect blocking
+                        result = await asyncio.wait_for(
+                            stdio_session.call_tool("extract_keywords", arguments={"text": line, "top_k": 4}),
+                            timeout=10.0
+                        )
+                        stdio_single_json = _loads(result.content[0].text)
+                    except Exception as e:
+                        print(f"Error on line {i+1}: {e}")
+                        stdio_single_json = f"Error: {str(e)}"
+
+                    return {
+                        "line_id": i,
+                        "text": line,
+                        "stdio_single": stdio_single_json,
+                    }
+
+            results = await asyncio.gather(
+                *(process_line(i, line) for i, line in enumerate(lines))
+            )
+            results = sorted(results, key=lambda r: r["line_id"])
 
     print(f"Writing results to {OUTPUT_FILE}...")
     with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
-        json.dump(results, f, ensure_ascii=False, indent=2)
+        _dump_results(results, f)
     print("Done.")
 
 if __name__ == "__main__":
@@ -0,0 +1,78 @@
+"""Shared pytest fixtures for the mcp_jieba test suite."""
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import pytest
+
+HTTP_HOST = "127.0.0.1"
+HTTP_PORT = 8000
+
+
+def _wait_ready(host: str, port: int, timeout: float = 10.0) -> bool:
+    """
+    Poll until a TCP connection to (host, port) succeeds or timeout expires.
+
+    The poll interval starts tight (10ms) so a warm server is detected almost
+    immediately, then backs off exponentially to a 200ms cap so a slow boot
+    does not burn CPU on connection attempts.
+    """
+    deadline = time.monotonic() + timeout
+    interval = 0.01
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection((host, port), timeout=0.2):
+                return True
+        except OSError:
+            time.sleep(interval)
+            interval = min(interval * 2, 0.2)
+    return False
+
+
+@pytest.fixture(scope="session")
+def engine():
+    """
+    Process-wide JiebaEngine, built once for the whole test session.
+
+    Dictionary and stopword loading happen before the first test that uses
+    the fixture starts timing; every other test reuses the same instance.
+    """
+    from mcp_jieba.engine import get_engine
+
+    return get_engine()
+
+
+@pytest.fixture(scope="session")
+def http_server():
+    """
+    Start one HTTP server subprocess for the whole test session.
+
+    Readiness is detected by polling the listen socket instead of a fixed
+    sleep, so tests start as soon as the server binds. Yields the base URL.
+    """
+    # Inherit the full environment; skip .pyc writes and user-site scanning
+    # in the child to trim its import time. close_fds=False keeps CPython on
+    # the posix_spawn fast path (close_fds or start_new_session force the
+    # slower fork+exec branch).
+    child_env = {
+        **os.environ,
+        "PYTHONDONTWRITEBYTECODE": "1",
+        "PYTHONNOUSERSITE": "1",
+    }
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "mcp_jieba.server",
+         "--transport", "http", "--host", HTTP_HOST, "--port", str(HTTP_PORT)],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        env=child_env,
+        close_fds=False,
+    )
+    try:
+        if not _wait_ready(HTTP_HOST, HTTP_PORT):
+            pytest.fail(f"HTTP server did not become ready on {HTTP_HOST}:{HTTP_PORT}")
+        yield f"http://{HTTP_HOST}:{HTTP_PORT}"
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
@@ -0,0 +1,32 @@
+"""Test JiebaEngine batch APIs against the session-scoped engine fixture."""
+
+
+def test_process_batch(engine):
+    """Tokenization filters stopwords/punctuation and keeps input order."""
+    results = engine.process_batch(["我爱北京天安门。", "今天天气不错"], "exact")
+    assert len(results) == 2
+    assert "北京" in results[0] and "。" not in results[0]
+    assert all(isinstance(t, str) for r in results for t in r)
+
+
+def test_process_search_mode(engine):
+    """Search mode yields at least the exact-mode tokens."""
+    exact = engine.process_batch(["中华人民共和国"], "exact")[0]
+    search = engine.process_batch(["中华人民共和国"], "search")[0]
+    assert len(search) >= len(exact)
+
+
+def test_tag_batch(engine):
+    """POS tagging returns one {word: flag} dict per input."""
+    results = engine.tag_batch(["我爱北京"])
+    assert len(results) == 1
+    assert results[0].get("北京") == "ns"
+
+
+def test_extract_keywords_batch(engine):
+    """Keyword extraction honors top_k and returns [] for blank input."""
+    text = "今天天气不错。我们去公园散步。公园里有很多花。"
+    results = engine.extract_keywords_batch([text, ""], top_k=3)
+    assert len(results) == 2
+    assert 0 < len(results[0]) <= 3
+    assert results[1] == []
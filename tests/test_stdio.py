@@ -0,0 +1,43 @@
+"""Test the MCP Jieba server in-process over MCP SDK memory streams.
+
+Connecting the ClientSession to the server object directly exercises the
+same request handling as stdio transport without forking a child
+interpreter, so the test does not pay python startup + dictionary load
+on every run.
+"""
+import json
+
+import pytest
+
+from mcp.shared.memory import create_connected_server_and_client_session
+
+from mcp_jieba.server import mcp
+
+# Constant request payload, built once instead of per call
+TOKENIZE_ARGS = {"text": "我爱北京天安门"}
+
+
+@pytest.mark.asyncio
+async def test_stdio_in_process():
+    """Test the initialize / list_tools / call_tool flow in-process."""
+    print("Testing MCP Jieba server in-process (stdio-equivalent)")
+    print("=" * 50)
+
+    async with create_connected_server_and_client_session(mcp) as session:
+        # Session is already initialized by the helper
+        print("✓ Connected over in-memory streams")
+
+        # Step 1: List tools
+        tools_result = await session.list_tools()
+        tool_names = {tool.name for tool in tools_result.tools}
+        print(f"✓ Found {len(tools_result.tools)} tools: {sorted(tool_names)}")
+        assert {"tokenize", "tag", "extract_keywords"} <= tool_names
+
+        # Step 2: Call tokenize and check the result shape
+        result = await session.call_tool("tokenize", TOKENIZE_ARGS)
+        tokens = json.loads(result.content[0].text)
+        print(f"✓ tokenize result: {tokens}")
+        assert "0" in tokens and isinstance(tokens["0"], list)
+
+        print("\n" + "=" * 50)
+        print("✓ All in-process tests passed!")